@@ -12,11 +12,52 @@ import json
 import math
 import numpy as np
 from typing import Dict, List, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # orjson اختياري لتسريع تصدير JSON، ويُستخدم json القياسي بدونه
+    orjson = None
 
-@dataclass
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba اختياري: تعمل الدوال المسرّعة كدوال بايثون عادية بدونه
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+# حقول العقد التي يعتمد عليها جدول الإيجار والخصم
+_SCHEDULE_FIELDS = (
+    'contract_duration',
+    'grace_period',
+    'rent_increase_interval',
+    'rent_increase_rate',
+    'capitalization_rate',
+)
+
+
+# المعاملات التي تتغير بتغيرها تكاليف التطوير المحسوبة
+_COST_AFFECTING = frozenset({
+    'land_area',
+    'building_factor',
+    'building_ratio',
+    'construction_cost_per_sqm',
+    'landscaping_cost_per_sqm',
+    'infrastructure_cost_per_sqm',
+    'design_cost_ratio',
+    'supervision_cost_ratio',
+    'contingency_cost_ratio',
+})
+
+
+@dataclass(slots=True)
 class ContractInputs:
     """بيانات العقد الأساسية"""
     contract_duration: int = 20  # مدة العقد بالسنوات
@@ -26,7 +67,7 @@ class ContractInputs:
     capitalization_rate: float = 7.0  # معدل الرسملة %
 
 
-@dataclass
+@dataclass(slots=True)
 class PropertyInputs:
     """بيانات العقار والتطوير"""
     land_area: float = 10000.0  # مساحة الأرض م²
@@ -38,7 +79,7 @@ class PropertyInputs:
     development_years: int = 2  # سنوات التنفيذ
 
 
-@dataclass
+@dataclass(slots=True)
 class CostRatios:
     """نسب التكاليف الإضافية"""
     design_cost_ratio: float = 7.0  # نسبة تكاليف التصميم %
@@ -46,7 +87,7 @@ class CostRatios:
     contingency_cost_ratio: float = 2.0  # نسبة تكاليف الطوارئ %
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CashFlowItem:
     """عنصر التدفق النقدي السنوي"""
     year: int
@@ -56,6 +97,168 @@ class CashFlowItem:
     rent_increase_rate: float = 0.0
 
 
+@njit(cache=True)
+def _irr_newton(flows: np.ndarray, guess: float, max_iter: int) -> float:
+    """حلقة نيوتن-رافسون لمعدل العائد الداخلي (نسبة عشرية) على مصفوفة التدفقات"""
+    irr_guess = guess
+    
+    for _ in range(max_iter):
+        # حساب NPV ومشتقته مع تحديث معامل الخصم تراكمياً بدل الرفع للأس
+        npv = 0.0
+        npv_derivative = 0.0
+        factor = 1.0
+        one_plus_r = 1.0 + irr_guess
+        
+        for t, flow in enumerate(flows):
+            npv += flow / factor
+            if t > 0:
+                npv_derivative -= t * flow / (factor * one_plus_r)
+            factor *= one_plus_r
+        
+        # تحديث التقدير
+        if abs(npv_derivative) < 1e-10:
+            break
+        
+        new_guess = irr_guess - npv / npv_derivative
+        
+        # التحقق من التقارب
+        if abs(new_guess - irr_guess) < 1e-8:
+            irr_guess = new_guess
+            break
+        
+        irr_guess = new_guess
+        
+        # تجنب القيم السالبة المفرطة
+        if irr_guess < -0.99:
+            irr_guess = -0.99
+    
+    return irr_guess
+
+
+@njit(cache=True)
+def _fill_schedule(duration: int, grace: int, interval: int, rate_pct: float, cap_pct: float,
+                   base_rent: float, total_cost: float, rent_out: np.ndarray, dcf_out: np.ndarray,
+                   cum_out: np.ndarray, inc_out: np.ndarray) -> float:
+    """
+    ملء مصفوفات التدفقات النقدية الأربع في مرور واحد على سنوات العقد
+    
+    Returns:
+        float: صافي القيمة الحالية
+    """
+    rate_mul = 1.0 + rate_pct / 100
+    disc_step = 1.0 + cap_pct / 100
+    current_rent = base_rent
+    discount_factor = 1.0
+    cumulative = -total_cost
+    
+    for i in range(duration):
+        year = i + 1
+        yearly_rent = 0.0
+        increase_rate = 0.0
+        
+        # الإيجار يبدأ بعد فترة السماح ويزيد كل interval سنة بعد أول سنة إيجار
+        if year > grace:
+            if year > grace + 1 and (year - grace - 1) % interval == 0:
+                current_rent *= rate_mul
+                increase_rate = rate_pct
+            yearly_rent = current_rent
+        
+        discount_factor *= disc_step
+        discounted_cash_flow = yearly_rent / discount_factor
+        cumulative += discounted_cash_flow
+        
+        rent_out[i] = yearly_rent
+        dcf_out[i] = discounted_cash_flow
+        cum_out[i] = cumulative
+        inc_out[i] = increase_rate
+    
+    # صافي القيمة الحالية بصيغة هورنر: npv = (npv + الإيجار) * 1/(1+c) من آخر سنة للأولى
+    inv_disc_step = 1.0 / disc_step
+    npv = 0.0
+    for i in range(duration - 1, -1, -1):
+        npv = (npv + rent_out[i]) * inv_disc_step
+    
+    return npv - total_cost
+
+
+@njit(parallel=True, cache=True)
+def _sweep_cap_rate(cap_rates: np.ndarray, duration: int, grace: int, interval: int,
+                    rent_pct: float, total_cost: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    الإيجار الأمثل وصافي القيمة الحالية لكل معدل رسملة، مع توزيع القيم على الأنوية
+    
+    Returns:
+        tuple: (الإيجارات المثلى, صافي القيمة الحالية, إجمالي العوائد)
+    """
+    V = cap_rates.shape[0]
+    out_rent = np.empty(V)
+    out_npv = np.empty(V)
+    out_returns = np.empty(V)
+    rate_mul = 1.0 + rent_pct / 100
+    
+    for v in prange(V):
+        disc_step = 1.0 + cap_rates[v] / 100
+        discount_factor = 1.0
+        multiplier = 1.0
+        rent_factor = 0.0
+        multiplier_total = 0.0
+        
+        for i in range(duration):
+            year = i + 1
+            discount_factor *= disc_step
+            if year > grace:
+                if year > grace + 1 and (year - grace - 1) % interval == 0:
+                    multiplier *= rate_mul
+                rent_factor += multiplier / discount_factor
+                multiplier_total += multiplier
+        
+        # R = C / S، ولا يوجد إيجار مربح إذا لم تكن هناك سنوات إيجار فعلية
+        rent = total_cost / rent_factor if rent_factor > 0 else 0.0
+        out_rent[v] = rent
+        out_npv[v] = -total_cost + rent * rent_factor
+        out_returns[v] = rent * multiplier_total
+    
+    return out_rent, out_npv, out_returns
+
+
+def _irr_newton_numpy(flows: np.ndarray, guess: float, max_iter: int) -> float:
+    """نسخة NumPy من حلقة نيوتن-رافسون تُستخدم عند عدم توفر numba"""
+    t = np.arange(len(flows), dtype=np.float64)
+    weighted_flows = t * flows
+    
+    # مصفوفات مؤقتة تُحجز مرة واحدة وتُعاد كتابتها في كل تكرار
+    factor = np.empty_like(flows)
+    buffer = np.empty_like(flows)
+    
+    irr_guess = guess
+    
+    for _ in range(max_iter):
+        one_plus_r = 1.0 + irr_guess
+        np.power(one_plus_r, t, out=factor)
+        npv = np.divide(flows, factor, out=buffer).sum()
+        np.multiply(factor, one_plus_r, out=factor)
+        npv_derivative = -np.divide(weighted_flows, factor, out=buffer).sum()
+        
+        # تحديث التقدير
+        if abs(npv_derivative) < 1e-10:
+            break
+        
+        new_guess = irr_guess - npv / npv_derivative
+        
+        # التحقق من التقارب
+        if abs(new_guess - irr_guess) < 1e-8:
+            irr_guess = new_guess
+            break
+        
+        irr_guess = new_guess
+        
+        # تجنب القيم السالبة المفرطة
+        if irr_guess < -0.99:
+            irr_guess = -0.99
+    
+    return float(irr_guess)
+
+
 class RealEstateCalculator:
     """حاسبة الإيجار العقاري المتقدمة"""
     
@@ -64,6 +267,14 @@ class RealEstateCalculator:
         self.property = property_data
         self.costs = cost_ratios
         self._calculated_costs = None
+        self._schedule_cache: Dict[tuple, Tuple[np.ndarray, np.ndarray]] = {}
+        
+        # الكائن الذي يحمل كل معامل، لتحديثه مباشرة في تحليل الحساسية
+        self._param_owner = (
+            {f.name: self.contract for f in fields(ContractInputs)}
+            | {f.name: self.property for f in fields(PropertyInputs)}
+            | {f.name: self.costs for f in fields(CostRatios)}
+        )
     
     def calculate_development_costs(self) -> Dict[str, float]:
         """حساب تكاليف التطوير الإجمالية"""
@@ -107,7 +318,49 @@ class RealEstateCalculator:
         
         return self._calculated_costs
     
-    def calculate_npv(self, annual_rent: float) -> Tuple[float, List[CashFlowItem]]:
+    def _schedule(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        جدول مضاعفات الإيجار ومعاملات الخصم لكل سنة من سنوات العقد
+        
+        لا يعتمد الجدول على قيمة الإيجار الأساسي، فالإيجار في السنة هو
+        الإيجار الأساسي مضروباً في مضاعف تلك السنة.
+        
+        Returns:
+            tuple: (مضاعفات الإيجار, معاملات الخصم)
+        """
+        key = tuple(getattr(self.contract, name) for name in _SCHEDULE_FIELDS)
+        cached = self._schedule_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        duration, grace, interval, rent_rate, cap_rate = key
+        rate_mul = 1.0 + rent_rate / 100
+        disc_step = 1.0 + cap_rate / 100
+        
+        years = np.arange(1, duration + 1)
+        
+        # لا إيجار خلال فترة السماح، ثم زيادة كل interval سنة
+        active = years > grace
+        steps = np.maximum(0, (years - grace - 1) // interval)
+        multiplier = rate_mul ** steps * active
+        
+        # معامل الخصم كحاصل ضرب تراكمي بدل الرفع للأس لكل سنة
+        discount = np.cumprod(np.full(duration, disc_step))
+        
+        # المصفوفات مشتركة بين الاستدعاءات فتُجعل للقراءة فقط
+        multiplier.flags.writeable = False
+        discount.flags.writeable = False
+        
+        self._schedule_cache[key] = (multiplier, discount)
+        return multiplier, discount
+    
+    def _discounted_rents(self, annual_rent: float) -> Tuple[np.ndarray, np.ndarray]:
+        """الإيجارات السنوية والتدفقات المخصومة لإيجار أساسي معين"""
+        multiplier, discount = self._schedule()
+        rents = annual_rent * multiplier
+        return rents, rents / discount
+    
+    def calculate_npv(self, annual_rent: float) -> Tuple[float, Dict[str, np.ndarray]]:
         """
         حساب صافي القيمة الحالية والتدفقات النقدية
         
@@ -115,95 +368,117 @@ class RealEstateCalculator:
             annual_rent: الإيجار السنوي الأساسي
             
         Returns:
-            tuple: (صافي القيمة الحالية, قائمة التدفقات النقدية)
+            tuple: (صافي القيمة الحالية, مصفوفات التدفقات النقدية لكل سنة)
+                المفاتيح: annual_rent, dcf, cum, inc_rate
         """
         development_costs = self.calculate_development_costs()
         total_cost = development_costs['total_development_cost']
+        contract = self.contract
+        
+        if NUMBA_AVAILABLE:
+            duration = contract.contract_duration
+            cash_flows = {name: np.empty(duration) for name in ('annual_rent', 'dcf', 'cum', 'inc_rate')}
+            npv = _fill_schedule(
+                int(duration), int(contract.grace_period), int(contract.rent_increase_interval),
+                float(contract.rent_increase_rate), float(contract.capitalization_rate),
+                float(annual_rent), float(total_cost),
+                cash_flows['annual_rent'], cash_flows['dcf'], cash_flows['cum'], cash_flows['inc_rate']
+            )
+            return float(npv), cash_flows
+        
+        rents, dcf = self._discounted_rents(annual_rent)
+        npv = -total_cost + dcf.sum()
+        
+        # سنوات تطبيق الزيادة الدورية (بعد أول سنة إيجار)
+        since_start = np.arange(contract.contract_duration) - contract.grace_period
+        increased = (since_start > 0) & (since_start % contract.rent_increase_interval == 0)
+        
+        cash_flows = {
+            'annual_rent': rents,
+            'dcf': dcf,
+            'cum': -total_cost + np.cumsum(dcf),
+            'inc_rate': np.where(increased, contract.rent_increase_rate, 0.0)
+        }
         
-        # البدء بالتكلفة الأولية (قيمة سالبة)
-        npv = -total_cost
-        cumulative_cash_flow = -total_cost
-        cash_flows = []
-        
-        current_rent = annual_rent
-        
-        for year in range(1, self.contract.contract_duration + 1):
-            yearly_rent = 0.0
-            increase_rate = 0.0
-            
-            # تطبيق منطق بدء الإيجار بعد فترة السماح
-            if year > self.contract.grace_period:
-                yearly_rent = current_rent
-                
-                # تطبيق الزيادات الدورية
-                if (year > self.contract.grace_period and 
-                    (year - self.contract.grace_period - 1) % self.contract.rent_increase_interval == 0 and 
-                    year > self.contract.grace_period + 1):
-                    
-                    increase_rate = self.contract.rent_increase_rate
-                    current_rent *= (1 + self.contract.rent_increase_rate / 100)
-                    yearly_rent = current_rent
-            
-            # حساب التدفق المخصوم
-            discount_factor = (1 + self.contract.capitalization_rate / 100) ** year
-            discounted_cash_flow = yearly_rent / discount_factor
-            
-            # تحديث NPV والتدفق التراكمي
-            npv += discounted_cash_flow
-            cumulative_cash_flow += discounted_cash_flow
-            
-            # إضافة عنصر التدفق النقدي
-            cash_flows.append(CashFlowItem(
+        return float(npv), cash_flows
+    
+    @staticmethod
+    def cash_flow_items(cash_flows: Dict[str, np.ndarray]) -> List[CashFlowItem]:
+        """تحويل مصفوفات التدفقات النقدية إلى قائمة CashFlowItem"""
+        return [
+            CashFlowItem(
                 year=year,
-                annual_rent=yearly_rent,
-                discounted_cash_flow=discounted_cash_flow,
-                cumulative_cash_flow=cumulative_cash_flow,
+                annual_rent=rent,
+                discounted_cash_flow=discounted,
+                cumulative_cash_flow=cumulative,
                 rent_increase_rate=increase_rate
-            ))
-        
-        return npv, cash_flows
+            )
+            for year, (rent, discounted, cumulative, increase_rate) in enumerate(zip(
+                cash_flows['annual_rent'].tolist(),
+                cash_flows['dcf'].tolist(),
+                cash_flows['cum'].tolist(),
+                cash_flows['inc_rate'].tolist()
+            ), start=1)
+        ]
     
-    def find_optimal_rent(self, tolerance: float = 1000.0, max_iterations: int = 100) -> Dict[str, float]:
+    def find_optimal_rent(self, tolerance: float = 1000.0, max_iterations: int = 100,
+                          lean: bool = False) -> Dict[str, float]:
         """
-        البحث عن أعلى إيجار مربح باستخدام البحث الثنائي المحسن
+        حساب الإيجار الأمثل الذي يغطي تكاليف التطوير (صافي القيمة الحالية = صفر)
+        
+        صافي القيمة الحالية خطي في الإيجار الأساسي R:
+        NPV(R) = -C + R * S حيث S = Σ (مضاعف الإيجار / معامل الخصم)
+        لذلك يُحسب الإيجار الأمثل مباشرة R = C / S دون بحث عددي.
         
         Args:
-            tolerance: دقة البحث (ريال)
-            max_iterations: عدد التكرارات القصوى
+            tolerance: غير مستخدم، محفوظ للتوافق مع الواجهة السابقة
+            max_iterations: غير مستخدم، محفوظ للتوافق مع الواجهة السابقة
+            lean: حساب النتائج الرئيسية فقط (الإيجار وصافي القيمة وإجمالي العوائد)
+                دون معدل العائد الداخلي وفترة الاسترداد والتدفقات النقدية
             
         Returns:
             dict: النتائج المحسوبة
         """
-        low = 0.0
-        high = 100_000_000.0  # 100 مليون كحد أقصى
-        optimal_rent = 0.0
-        optimal_npv = float('-inf')
-        iterations = 0
-        
-        while high - low > tolerance and iterations < max_iterations:
-            mid = (low + high) / 2
-            npv, _ = self.calculate_npv(mid)
-            
-            if npv >= 0:
-                optimal_rent = mid
-                optimal_npv = npv
-                low = mid
-            else:
-                high = mid
-            
-            iterations += 1
+        total_cost = self.calculate_development_costs()['total_development_cost']
+        
+        multiplier, discount = self._schedule()
+        rent_factor = float((multiplier / discount).sum())
+        
+        # لا يوجد إيجار مربح إذا لم تكن هناك سنوات إيجار فعلية
+        optimal_rent = total_cost / rent_factor if rent_factor > 0 else 0.0
         
+        if lean:
+            return self._lean_results(
+                optimal_rent,
+                -total_cost + optimal_rent * rent_factor,
+                optimal_rent * float(multiplier.sum())
+            )
+        
+        return self._optimal_rent_results(optimal_rent)
+    
+    def _lean_results(self, optimal_rent: float, npv: float, total_returns: float) -> Dict[str, float]:
+        """النتائج الرئيسية للإيجار الأمثل دون الحسابات التفصيلية"""
+        return {
+            'optimal_annual_rent': optimal_rent,
+            'npv': npv,
+            'total_returns': total_returns,
+            'total_development_cost': self.calculate_development_costs()['total_development_cost'],
+            'iterations': 1
+        }
+    
+    def _optimal_rent_results(self, optimal_rent: float) -> Dict[str, float]:
+        """النتائج التفصيلية لإيجار أمثل محسوب مسبقاً"""
         # حساب النتائج التفصيلية للإيجار الأمثل
         final_npv, cash_flows = self.calculate_npv(optimal_rent)
         
         # حساب فترة الاسترداد
-        payback_period = self._calculate_payback_period(cash_flows)
+        payback_period = self._calculate_payback_period(optimal_rent)
         
         # حساب معدل العائد الداخلي
-        irr = self._calculate_irr(cash_flows)
+        irr = self._calculate_irr(cash_flows['annual_rent'])
         
         # حساب إجمالي العوائد
-        total_returns = sum(cf.annual_rent for cf in cash_flows)
+        total_returns = float(cash_flows['annual_rent'].sum())
         average_annual_return = total_returns / self.contract.contract_duration if self.contract.contract_duration > 0 else 0
         
         development_costs = self.calculate_development_costs()
@@ -216,105 +491,198 @@ class RealEstateCalculator:
             'total_returns': total_returns,
             'average_annual_return': average_annual_return,
             'total_development_cost': development_costs['total_development_cost'],
-            'iterations': iterations,
+            'iterations': 1,
             'cash_flows': cash_flows
         }
     
-    def _calculate_payback_period(self, cash_flows: List[CashFlowItem]) -> float:
-        """حساب فترة الاسترداد"""
-        for i, cf in enumerate(cash_flows):
-            if cf.cumulative_cash_flow >= 0:
-                if i == 0:
-                    return 1.0
-                
-                # تقدير دقيق للفترة باستخدام الاستيفاء الخطي
-                prev_cf = cash_flows[i-1]
-                ratio = abs(prev_cf.cumulative_cash_flow) / (cf.cumulative_cash_flow - prev_cf.cumulative_cash_flow)
-                return i + ratio
-        
-        return float(self.contract.contract_duration)
-    
-    def _calculate_irr(self, cash_flows: List[CashFlowItem], max_iterations: int = 1000) -> float:
+    def _calculate_payback_period(self, annual_rent: float) -> float:
+        """
+        حساب فترة الاسترداد بصيغة مغلقة
+        
+        الإيجار ثابت داخل كل فترة زيادة ومعامل الخصم هندسي، لذلك مجموع التدفقات
+        المخصومة لكل فترة متسلسلة هندسية. تُحدد الفترة التي يصبح فيها التدفق
+        التراكمي غير سالب، ثم السنة داخلها بحل المتسلسلة، ثم يُستخدم الاستيفاء
+        الخطي بين نهايتي السنتين كما في الجدول السنوي.
+        """
+        duration = self.contract.contract_duration
+        grace = self.contract.grace_period
+        interval = self.contract.rent_increase_interval
+        total_cost = self.calculate_development_costs()['total_development_cost']
+        
+        if duration <= 0:
+            return float(duration)
+        if total_cost <= 0:
+            return 1.0
+        if duration <= grace:
+            return float(duration)
+        
+        q = 1 / (1 + self.contract.capitalization_rate / 100)
+        
+        def discounted_sum(rent, first_year, years):
+            """مجموع rent * q^y لعدد years سنة بدءاً من first_year"""
+            if q == 1:
+                return rent * years
+            return rent * q ** first_year * (1 - q ** years) / (1 - q)
+        
+        # فترات الإيجار الثابت بعد فترة السماح
+        block = np.arange(-(-(duration - grace) // interval))
+        starts = grace + 1 + block * interval
+        lengths = np.minimum(starts + interval - 1, duration) - starts + 1
+        rents = annual_rent * (1 + self.contract.rent_increase_rate / 100) ** block
+        block_ends = -total_cost + np.cumsum(discounted_sum(rents, starts, lengths))
+        
+        recovered = block_ends >= 0
+        if not recovered.any():
+            return float(duration)
+        
+        # البحث الثنائي يتطلب تدفقاً تراكمياً متزايداً (إيجارات غير سالبة)
+        if (rents >= 0).all():
+            k = int(np.searchsorted(block_ends, 0.0))
+        else:
+            k = int(np.argmax(recovered))
+        
+        rent = float(rents[k])
+        first_year = int(starts[k])
+        before = -total_cost if k == 0 else float(block_ends[k - 1])
+        
+        # أقل عدد سنوات n داخل الفترة يغطي الرصيد السالب before
+        if q == 1:
+            years = -before / rent
+        else:
+            years = math.log(1 + before * (1 - q) / (rent * q ** first_year)) / math.log(q)
+        years = min(max(math.ceil(years), 1), int(lengths[k]))
+        
+        # تصحيح أخطاء التقريب حول الحد الفاصل
+        while years > 1 and before + discounted_sum(rent, first_year, years - 1) >= 0:
+            years -= 1
+        
+        year = first_year + years - 1
+        if year == 1:
+            return 1.0
+        
+        # تقدير دقيق للفترة باستخدام الاستيفاء الخطي
+        prev_cumulative = before + discounted_sum(rent, first_year, years - 1)
+        ratio = -prev_cumulative / (rent * q ** year)
+        return float(year - 1 + ratio)
+    
+    def _calculate_irr(self, annual_rents: np.ndarray, max_iterations: int = 1000) -> float:
         """حساب معدل العائد الداخلي باستخدام طريقة نيوتن-رافسون"""
         development_costs = self.calculate_development_costs()
         initial_investment = development_costs['total_development_cost']
         
         # تحضير التدفقات النقدية
-        flows = [-initial_investment] + [cf.annual_rent for cf in cash_flows]
+        flows = np.concatenate(([-initial_investment], annual_rents)).astype(np.float64)
         
-        # تقدير أولي لمعدل العائد
-        irr_guess = 0.1  # 10%
+        # تقدير أولي لمعدل العائد 10%
+        newton = _irr_newton if NUMBA_AVAILABLE else _irr_newton_numpy
+        irr = newton(flows, 0.1, max_iterations)
         
-        for _ in range(max_iterations):
-            # حساب NPV ومشتقته
-            npv = 0
-            npv_derivative = 0
-            
-            for t, flow in enumerate(flows):
-                factor = (1 + irr_guess) ** t
-                npv += flow / factor
-                if t > 0:
-                    npv_derivative -= t * flow / ((1 + irr_guess) ** (t + 1))
-            
-            # تحديث التقدير
-            if abs(npv_derivative) < 1e-10:
-                break
+        return irr * 100  # تحويل إلى نسبة مئوية
+    
+    def _sweep_optimal_rents(self, parameter: str,
+                             variations: List[float]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        حساب الإيجار الأمثل لجميع قيم أحد معاملات جدول الإيجار دفعة واحدة
+        
+        تُبنى مصفوفات المضاعفات ومعاملات الخصم بأبعاد (عدد القيم, عدد السنوات)
+        بتمديد قيمة المعامل على محور جديد، ثم يُحسب R = C / S لكل قيمة بقسمة واحدة.
+        
+        Returns:
+            tuple: (الإيجارات المثلى, صافي القيمة الحالية, إجمالي العوائد)
+        """
+        total_cost = self.calculate_development_costs()['total_development_cost']
+        
+        if parameter == 'capitalization_rate':
+            caps = np.asarray(variations, dtype=np.float64)
             
-            new_guess = irr_guess - npv / npv_derivative
+            if NUMBA_AVAILABLE:
+                contract = self.contract
+                return _sweep_cap_rate(
+                    caps, int(contract.contract_duration),
+                    int(contract.grace_period), int(contract.rent_increase_interval),
+                    float(contract.rent_increase_rate), float(total_cost)
+                )
             
-            # التحقق من التقارب
-            if abs(new_guess - irr_guess) < 1e-8:
-                irr_guess = new_guess
-                break
+            # المضاعفات لا تعتمد على معدل الرسملة، ومعاملات الخصم مصفوفة (عدد القيم, عدد السنوات)
+            multiplier, _ = self._schedule()
+            years = np.arange(1, self.contract.contract_duration + 1)
+            discount = np.power.outer(1 + caps / 100, years)
             
-            irr_guess = new_guess
+            rent_factors = (multiplier[None, :] / discount).sum(axis=1)
+            positive = rent_factors > 0
+            optimal_rents = np.where(positive, total_cost / np.where(positive, rent_factors, 1.0), 0.0)
             
-            # تجنب القيم السالبة المفرطة
-            if irr_guess < -0.99:
-                irr_guess = -0.99
+            return optimal_rents, -total_cost + optimal_rents * rent_factors, optimal_rents * multiplier.sum()
+        
+        terms = {name: np.full(len(variations), float(getattr(self.contract, name))) for name in _SCHEDULE_FIELDS}
+        terms[parameter] = np.asarray(variations, dtype=np.float64)
+        terms = {name: values[:, None] for name, values in terms.items()}
+        
+        # السنوات حتى أطول مدة عقد، مع إهمال السنوات بعد نهاية كل عقد
+        years = np.arange(1, int(terms['contract_duration'].max(initial=0)) + 1)[None, :]
+        active = (years > terms['grace_period']) & (years <= terms['contract_duration'])
+        steps = np.maximum(0, (years - terms['grace_period'] - 1) // terms['rent_increase_interval'])
+        multiplier = (1 + terms['rent_increase_rate'] / 100) ** steps * active
+        discount = (1 + terms['capitalization_rate'] / 100) ** years
         
-        return irr_guess * 100  # تحويل إلى نسبة مئوية
+        rent_factors = (multiplier / discount).sum(axis=1)
+        positive = rent_factors > 0
+        optimal_rents = np.where(positive, total_cost / np.where(positive, rent_factors, 1.0), 0.0)
+        
+        return optimal_rents, -total_cost + optimal_rents * rent_factors, optimal_rents * multiplier.sum(axis=1)
     
-    def sensitivity_analysis(self, parameter: str, variations: List[float]) -> List[Dict]:
+    def sensitivity_analysis(self, parameter: str, variations: List[float], lean: bool = True) -> List[Dict]:
         """
         تحليل الحساسية لمعرفة تأثير تغيير المعاملات
         
         Args:
             parameter: اسم المعامل المراد تحليله
             variations: قائمة القيم المختلفة للاختبار
+            lean: الاكتفاء بالنتائج الرئيسية لكل قيمة (انظر find_optimal_rent)
             
         Returns:
             list: نتائج التحليل لكل قيمة
         """
         results = []
-        original_value = getattr(self.contract, parameter, None) or getattr(self.property, parameter, None) or getattr(self.costs, parameter, None)
         
-        for variation in variations:
+        # معاملات جدول الإيجار لا تؤثر على التكاليف فيُحسب الإيجار الأمثل لها دفعة واحدة
+        sweep = None
+        if parameter in _SCHEDULE_FIELDS:
+            optimal_rents, npvs, total_returns = (
+                values.tolist() for values in self._sweep_optimal_rents(parameter, variations)
+            )
+            sweep = list(zip(optimal_rents, npvs, total_returns))
+        
+        owner = self._param_owner[parameter]
+        original_value = getattr(owner, parameter)
+        
+        for i, variation in enumerate(variations):
             # تحديث القيمة مؤقتاً
-            if hasattr(self.contract, parameter):
-                setattr(self.contract, parameter, variation)
-            elif hasattr(self.property, parameter):
-                setattr(self.property, parameter, variation)
-            elif hasattr(self.costs, parameter):
-                setattr(self.costs, parameter, variation)
+            setattr(owner, parameter, variation)
             
-            # إعادة تعيين التكاليف المحسوبة
-            self._calculated_costs = None
+            # إعادة تعيين التكاليف المحسوبة عند تغير أحد مدخلاتها فقط
+            if parameter in _COST_AFFECTING:
+                self._calculated_costs = None
             
             # حساب النتائج
-            result = self.find_optimal_rent()
+            if sweep is None:
+                result = self.find_optimal_rent(lean=lean)
+            elif lean:
+                result = self._lean_results(*sweep[i])
+            else:
+                result = self._optimal_rent_results(sweep[i][0])
             result[parameter] = variation
             results.append(result)
         
         # استعادة القيمة الأصلية
-        if hasattr(self.contract, parameter):
-            setattr(self.contract, parameter, original_value)
-        elif hasattr(self.property, parameter):
-            setattr(self.property, parameter, original_value)
-        elif hasattr(self.costs, parameter):
-            setattr(self.costs, parameter, original_value)
+        setattr(owner, parameter, original_value)
         
-        self._calculated_costs = None
+        if parameter in _COST_AFFECTING:
+            self._calculated_costs = None
+        
+        # تفريغ جداول القيم المؤقتة التي أُنشئت أثناء التحليل
+        if parameter in _SCHEDULE_FIELDS:
+            self._schedule_cache.clear()
         
         return results
     
@@ -322,16 +690,23 @@ class RealEstateCalculator:
         """تصدير النتائج إلى ملف JSON"""
         results = self.find_optimal_rent()
         
-        # تحويل CashFlowItem إلى dict
-        cash_flows_dict = []
-        for cf in results['cash_flows']:
-            cash_flows_dict.append({
-                'year': cf.year,
-                'annual_rent': cf.annual_rent,
-                'discounted_cash_flow': cf.discounted_cash_flow,
-                'cumulative_cash_flow': cf.cumulative_cash_flow,
-                'rent_increase_rate': cf.rent_increase_rate
-            })
+        # تحويل مصفوفات التدفقات النقدية إلى قائمة dict
+        cash_flows = results['cash_flows']
+        cash_flows_dict = [
+            {
+                'year': year,
+                'annual_rent': rent,
+                'discounted_cash_flow': discounted,
+                'cumulative_cash_flow': cumulative,
+                'rent_increase_rate': increase_rate
+            }
+            for year, (rent, discounted, cumulative, increase_rate) in enumerate(zip(
+                cash_flows['annual_rent'].tolist(),
+                cash_flows['dcf'].tolist(),
+                cash_flows['cum'].tolist(),
+                cash_flows['inc_rate'].tolist()
+            ), start=1)
+        ]
         
         export_data = {
             'timestamp': datetime.now().isoformat(),
@@ -372,6 +747,17 @@ class RealEstateCalculator:
             'cash_flows': cash_flows_dict
         }
         
+        if orjson is not None:
+            payload = orjson.dumps(
+                export_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+            )
+            if filename:
+                with open(filename, 'wb') as f:
+                    f.write(payload)
+                return filename
+            return payload.decode('utf-8')
+        
         if filename:
             with open(filename, 'w', encoding='utf-8') as f:
                 json.dump(export_data, f, ensure_ascii=False, indent=2)
@@ -438,7 +824,7 @@ def main():
     print(f"{'السنة':<6} {'الإيجار السنوي':<15} {'التدفق المخصوم':<15} {'التدفق التراكمي':<15}")
     print("-" * 80)
     
-    for cf in results['cash_flows'][:5]:
+    for cf in calculator.cash_flow_items(results['cash_flows'])[:5]:
         print(f"{cf.year:<6} {cf.annual_rent:>14,.0f} {cf.discounted_cash_flow:>14,.0f} {cf.cumulative_cash_flow:>14,.0f}")
     
     # تصدير النتائج